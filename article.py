@@ -1,59 +1,92 @@
 # ReScience yaml parser
 # Released under the BSD two-clauses licence
 
+import datetime
+import functools
 import yaml
+try:
+    import dateutil.parser
+    _date_parser = dateutil.parser.parser()
+except ImportError:
+    _date_parser = None
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
 
 class Contributor:
+    __slots__ = ("role", "name", "fullname", "orcid", "email",
+                 "affiliations", "affil_str", "_lastname", "_abbrvname")
+
     def __init__(self, role, name, orcid="", email="", affiliations=[]):
         self.role = role
         self.name = name
         self.fullname = name
-        self.lastname = self.get_lastname(name)
-        self.abbrvname = self.get_abbrvname(name)
         self.orcid = orcid
         self.email = email
         self.affiliations = affiliations
+        self.affil_str = ",".join(affiliations)
+        self._lastname = None
+        self._abbrvname = None
+
+    # Only needed for authors, hence computed on first access
+    @property
+    def lastname(self):
+        if self._lastname is None:
+            self._lastname, self._abbrvname = self.parse_name(self.name)
+        return self._lastname
+
+    @property
+    def abbrvname(self):
+        if self._abbrvname is None:
+            self._lastname, self._abbrvname = self.parse_name(self.name)
+        return self._abbrvname
+
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def parse_name(name):
+        # Returns (lastname, abbrvname)
+        if not name: return "", ""
 
-    def get_abbrvname(self, name):
-        if not name: return ""
-        
+        # Rougier, Nicolas P.
         if ',' in name:
-            lastname = name.split(",")[0]
-            firstnames = name.split(",")[1].strip().split(" ")
+            parts = name.split(",")
+            lastname = parts[0].strip()
+            abbrvlast = parts[0]
+            firstnames = parts[1].strip().split(" ")
+        # Nicolas P. Rougier
         else:
-            lastname = name.split(" ")[-1]
-            firstnames = name.split(" ")[:-1]
-        abbrvname = ""
+            firstnames, sep, lastname = name.rpartition(" ")
+            abbrvlast = lastname
+            firstnames = firstnames.split(" ") if sep else []
+        # Jean-Pierre -> J.-P.
+        initials = []
         for firstname in firstnames:
-            if "-" in firstname:
-                for name in firstname.split("-"):
-                    abbrvname += name[0].strip().upper() + '.-'
-                abbrvname = abbrvname[:-1]
-            else:
-                abbrvname += firstname[0].strip().upper() + '.'
-        return abbrvname + " " + lastname
+            if firstname:
+                initials.append('.-'.join(part[0].strip().upper()
+                                          for part in firstname.split("-")) + '.')
+        return lastname, "".join(initials) + " " + abbrvlast
 
+    @staticmethod
+    def get_abbrvname(name):
+        return Contributor.parse_name(name)[1]
+
+    @staticmethod
+    def get_lastname(name):
+        return Contributor.parse_name(name)[0]
 
-    def get_lastname(self, name):
-        if not name: return ""
-        # Rougier, Nicolas P.
-        if ',' in name:
-            lastname = name.split(",")[0].strip()
-            firstname = name.split(",")[1].strip()
-        # Nicolas P. Rougier
-        else:
-            lastname = name.split(" ")[-1]
-            firstname = name.split(" ")[:-1]
-        return lastname
-    
 
 class Affiliation:
+    __slots__ = ("code", "name", "address")
+
     def __init__(self, code, name, address=""):
         self.code = code
         self.name = name
         self.address = address
 
 class Repository:
+    __slots__ = ("name", "url", "doi", "swh")
+
     def __init__(self, name, url, doi, swh=""):
         self.name = name
         self.url = url
@@ -61,6 +94,8 @@ class Repository:
         self.swh = swh
 
 class Replication:
+    __slots__ = ("cite", "bib", "url", "doi")
+
     def __init__(self, cite, bib, url, doi):
         self.cite = cite
         self.bib = bib
@@ -68,145 +103,209 @@ class Replication:
         self.doi = doi
 
 class Review:
+    __slots__ = ("url", "doi")
+
     def __init__(self, url, doi):
         self.url = url
         self.doi = doi
 
+# Textual date format, e.g. "01 November 2018"
+_DATE_FMT = "%d %B %Y"
+
+@functools.lru_cache(maxsize=1024)
+def _parse_date(date):
+    # Failed parses raise and are therefore never cached
+    if _date_parser is None:
+        raise ValueError("dateutil is not available")
+    date = _date_parser.parse(date)
+    return date, date.year, date.month, date.day, date.strftime(_DATE_FMT)
+
 class Date:
+    # The date string is only parsed when one of its fields is first read
+    __slots__ = ("_raw", "_fields")
+
     def __init__(self, date):
-        try:
-            import dateutil.parser
-
-            date = dateutil.parser.parse(date)
-            self.date = date
-            self.year = date.year
-            self.month = date.month
-            self.day = date.day
-            self.textual = self.date.strftime("%d %B %Y")
-        except:
-            import datetime
+        self._raw = date
+        self._fields = None
+
+    def _parse(self):
+        if self._fields is None:
+            # Empty dates (not yet known) skip the parser entirely
+            if self._raw:
+                try:
+                    self._fields = _parse_date(self._raw)
+                    return self._fields
+                except (ValueError, TypeError, OverflowError):
+                    pass
             now = datetime.datetime.now()
-            self.date = now
-            self.year = now.year
-            self.month = now.month
-            self.day = now.day
-            self.textual = ""
+            self._fields = now, now.year, now.month, now.day, ""
+        return self._fields
+
+    @property
+    def date(self):
+        return self._parse()[0]
+
+    @property
+    def year(self):
+        return self._parse()[1]
+
+    @property
+    def month(self):
+        return self._parse()[2]
+
+    @property
+    def day(self):
+        return self._parse()[3]
+
+    @property
+    def textual(self):
+        return self._parse()[4]
 
     def __str__(self):
         return self.textual
-        #return self.date.strftime("%d %B %Y")
+        #return self.date.strftime(_DATE_FMT)
 
     def __repr__(self):
         return self.textual
-        # return self.date.strftime("%d %B %Y")
+        # return self.date.strftime(_DATE_FMT)
         
 
+# Replace every null in the parsed YAML by an empty string
+def _normalize(node):
+    if node is None:
+        return ""
+    if isinstance(node, dict):
+        return {key: _normalize(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_normalize(value) for value in node]
+    return node
+
+# Merge a YAML list of single-key mappings into a single dict
+def _flatten(entries):
+    flat = {}
+    for entry in entries:
+        flat.update(entry)
+    return flat
+
+# "A", "A and B", "A, B and C" or "A et al." for more than three names
+def _author_list(names):
+    n = len(names)
+    if n > 3:
+        return names[0] + " et al."
+    elif n == 1:
+        return names[0]
+    elif n >= 2:
+        return ", ".join(names[:-1]) + " and " + names[-1]
+    return ""
+
 class Article:
+    # Defaults for fields that parse() may leave unset
+    title = ""
+    abstract = ""
+    type = ""
+    domain = ""
+    language = ""
+    bibliography = ""
+    keywords = ""
+    code = ""
+    data = ""
+    contact = ""
+
+    review = ""
+    replication = ""
+
+    date_received = ""
+    date_accepted = ""
+    date_published = ""
+
+    journal_name = ""
+    journal_issn = ""
+    journal_volume = ""
+    journal_issue = ""
+    article_number = ""
+    article_doi = ""
+    article_url = ""
+
     def __init__(self, data):
-        self.title = ""
-        self.absract = ""
-        self.type = ""
-        self.domain = ""
-        self.language = ""
-        self.bibliography = ""
-        self.keywords = []
+        # data is either a YAML string or an open file
         self.authors = []
         self.editors = []
         self.reviewers = []
+        self._by_role = {"author": self.authors,
+                         "editor": self.editors,
+                         "reviewer": self.reviewers}
         self.affiliations = []
-        self.code = ""
-        self.data = ""
-        self.contact = ""
-
-        self.review = ""
-        self.replication = ""
-        
-        self.date_received = ""
-        self.date_accepted = ""
-        self.date_published = ""
-
-        self.journal_name = "" 
-        self.journal_issn = ""
-        self.journal_volume = ""
-        self.journal_issue = ""
-        self.article_number = ""
-        self.article_doi = ""
-        self.article_url = ""
 
         self.parse(data)
 
-        # Build authors list
-        self.authors_short = "" # Family names only
-        self.authors_abbrv = "" # Abbreviated firsnames + Family names
-        self.authors_full = ""  # Full names
-        
-        n = len(self.authors)
-        if n > 3:
-            self.authors_short = self.authors[0].lastname + " et al."
-            self.authors_abbrv = self.authors[0].abbrvname + " et al."
-            self.authors_full = self.authors[0].fullname + " et al."
-        elif n==1:
-            self.authors_short += self.authors[0].lastname
-            self.authors_abbrv += self.authors[0].abbrvname
-            self.authors_full += self.authors[0].fullname
-        else:
-            for i in range(n-2):
-                self.authors_short += self.authors[i].lastname + ", "
-                self.authors_abbrv += self.authors[i].abbrvname + ", "
-                self.authors_full += self.authors[i].fullname + ", "
-
-            if n >= 2:
-                self.authors_short += self.authors[n-2].lastname + " and "
-                self.authors_short += self.authors[n-1].lastname
-
-                self.authors_abbrv += self.authors[n-2].abbrvname + " and "
-                self.authors_abbrv += self.authors[n-1].abbrvname
+    # Author lists are only built when first requested, in a single pass
+    # shared by the three variants
+    @functools.cached_property
+    def _author_lists(self):
+        lastnames, abbrvnames, fullnames = [], [], []
+        for author in self.authors:
+            lastnames.append(author.lastname)
+            abbrvnames.append(author.abbrvname)
+            fullnames.append(author.fullname)
+        return (_author_list(lastnames),
+                _author_list(abbrvnames),
+                _author_list(fullnames))
+
+    @property
+    def authors_short(self):
+        # Family names only
+        return self._author_lists[0]
+
+    @property
+    def authors_abbrv(self):
+        # Abbreviated firsnames + Family names
+        return self._author_lists[1]
+
+    @property
+    def authors_full(self):
+        # Full names
+        return self._author_lists[2]
 
-                self.authors_full += self.authors[n-2].fullname + " and "
-                self.authors_full += self.authors[n-1].fullname
-
-            
-        
     def parse(self, data):
-        document = yaml.load(data, Loader=yaml.SafeLoader)
+        raw = yaml.load(data, Loader=_SafeLoader)
+        document = _normalize(raw)
 
         self.title = document.get("title", "")
-        self.abstract = document.get("abstract","") or ""
-        self.keywords = document["keywords"] or ""
-        self.type = document["type"] or ""
-        self.domain = document["domain"] or ""
-        self.language = document["language"] or ""
-        self.bibliography = document["bibliography"] or ""
+        self.abstract = document.get("abstract", "")
+        self.keywords = document["keywords"]
+        self.type = document["type"]
+        self.domain = document["domain"]
+        self.language = document["language"]
+        self.bibliography = document["bibliography"]
 
         # Miscellaneous dates
-        dates = {key:value for data in document["dates"]
-                           for key, value in data.items()}
-        self.date_received = Date(dates["received"] or "")
-        self.date_accepted = Date(dates["accepted"] or "")
-        self.date_published = Date(dates["published"] or "")
+        dates = _flatten(document["dates"])
+        self.date_received = Date(dates["received"])
+        self.date_accepted = Date(dates["accepted"])
+        self.date_published = Date(dates["published"])
         
-        # Add authors
-        for item in document["authors"]:
+        # Add authors (raw entries still tell null from empty affiliations)
+        for raw_item, item in zip(raw["authors"], document["authors"]):
             role = "author"
-            name = item["name"] or ""
-            orcid = item.get("orcid","") or ""
-            email = item.get("email","") or ""
-            if item["affiliations"] is not None:
-                if len(str(item["affiliations"])) > 1:
-                    affiliations = item["affiliations"].split(",")
-                    if "*" in affiliations:
-                        affiliations.remove("*")
-                        author = Contributor(role, name, orcid, email, affiliations)
-                        self.add_contributor(author)
-                        self.contact = author
-                    else:
-                        author = Contributor(role, name, orcid, email, affiliations)
-                        self.add_contributor(author)
-                else:
-                    affiliations = list(str(item["affiliations"]))
-                    author = Contributor(role, name, orcid, email, affiliations)
-                    self.add_contributor(author)
-                
+            name = item["name"]
+            orcid = item.get("orcid", "")
+            email = item.get("email", "")
+            # Authors with null affiliations are skipped
+            if raw_item["affiliations"] is None:
+                continue
+            affil = item["affiliations"]
+            if isinstance(affil, str) and "," in affil:
+                # "*" marks the contact author
+                codes = affil.split(",")
+                affiliations = [code for code in codes if code != "*"]
+                is_contact = len(affiliations) != len(codes)
+            else:
+                affiliations = [str(affil)] if affil != "" else []
+                is_contact = False
+            author = Contributor(role, name, orcid, email, affiliations)
+            self.add_contributor(author)
+            if is_contact:
+                self.contact = author
 
         # Add author affiliations
         for item in document["affiliations"]:
@@ -219,72 +318,63 @@ class Article:
         # Add editor & reviewers
         for item in document["contributors"]:
             role = item["role"]
-            name = item["name"] or ""
-            orcid = item.get("orcid","") or ""
+            name = item["name"]
+            orcid = item.get("orcid", "")
             contributor = Contributor(role, name, orcid)
             self.add_contributor(contributor)
 
             
         # Code repository (mandatory)
-        if "code" in document.keys():
-            code = {key:value for data in document["code"]
-                              for key, value in data.items()}
+        if "code" in document:
+            code = _flatten(document["code"])
             self.code = Repository("code",
-                                   code.get("url","") or "",
-                                   code.get("doi","") or "",
-                                   code.get("swh","") or "")
+                                   code.get("url", ""),
+                                   code.get("doi", ""),
+                                   code.get("swh", ""))
         else:
             raise IndexError("Code repository not found")
         
         # Data repository (optional)
-        if "data" in document.keys():
-            data = {key:value for data in document["data"]
-                              for key, value in data.items()}
+        if "data" in document:
+            data = _flatten(document["data"])
             self.data = Repository("data",
-                                   data.get("url","") or "",
-                                   data.get("doi","") or "")
+                                   data.get("url", ""),
+                                   data.get("doi", ""))
         else:
             self.data = Repository("data", "", "")
             
         # Review
-        review = {key:value for review in document["review"]
-                            for key, value in review.items()}
-        self.review = Review(review.get("url","") or "",
-                             review.get("doi","") or "")
+        review = _flatten(document["review"])
+        self.review = Review(review.get("url", ""),
+                             review.get("doi", ""))
 
         # Replication
-        replication = {key:value for replication in document["replication"]
-                                 for key, value in replication.items()}
-        self.replication = Replication(replication["cite"] or "",
-                                       replication["bib"] or "",
-                                       replication["url"] or "",
-                                       replication["doi"] or "")
+        replication = _flatten(document["replication"])
+        self.replication = Replication(replication["cite"],
+                                       replication["bib"],
+                                       replication["url"],
+                                       replication["doi"])
 
         # Article number & DOI
-        article = {key:value for article in document["article"]
-                             for key, value in article.items()}
-        self.article_number = article["number"] or ""
-        self.article_doi = article["doi"] or ""
-        self.article_url = article["url"] or ""
+        article = _flatten(document["article"])
+        self.article_number = article["number"]
+        self.article_doi = article["doi"]
+        self.article_url = article["url"]
 
         # Journal volume and issue
-        journal = {key:value for journal in document["journal"]
-                             for key, value in journal.items()}
+        journal = _flatten(document["journal"])
         self.journal_name = str(journal.get("name",""))
         self.journal_issn = str(journal.get("issn", ""))
-        self.journal_volume = journal["volume"] or ""
-        self.journal_issue = journal["issue"] or ""
+        self.journal_volume = journal["volume"]
+        self.journal_issue = journal["issue"]
         
                     
     def add_contributor(self, contributor):
-        if contributor.role == "author":
-            self.authors.append(contributor)
-        elif contributor.role == "editor":
-            self.editors.append(contributor)
-        elif contributor.role == "reviewer":
-            self.reviewers.append(contributor)
-        else:
-            raise(IndexError)
+        try:
+            self._by_role[contributor.role].append(contributor)
+        except KeyError:
+            raise IndexError("Unknown contributor role: %r"
+                             % contributor.role) from None
 
 
 
@@ -292,7 +382,7 @@ class Article:
 if __name__ == '__main__':
 
     with open("metadata.yaml") as file:
-        article = Article(file.read())
+        article = Article(file)
         print(article.authors_full)
         print(article.authors_abbrv)
         print(article.authors_short)
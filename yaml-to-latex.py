@@ -6,62 +6,62 @@ def generate_latex_metadata(filename, article):
 
     abstract = article.abstract.replace("&", "\&")
     
-    content = (
-        "% DO NOT EDIT - automatically generated from {filename}\n\n"
-        "\\def \\codeURL{{{_.code.url}}}\n"
-        "\\def \\codeDOI{{{_.code.doi}}}\n"
-        "\\def \\codeSWH{{{_.code.swh}}}\n"
-        "\\def \\dataURL{{{_.data.url}}}\n"
-        "\\def \\dataDOI{{{_.data.doi}}}\n"
-        "\\def \\editorNAME{{{_.editors[0].name}}}\n"
-        "\\def \\editorORCID{{{_.editors[0].orcid}}}\n"
-        "\\def \\reviewerINAME{{{_.reviewers[0].name}}}\n"
-        "\\def \\reviewerIORCID{{{_.reviewers[0].orcid}}}\n"
-        "\\def \\reviewerIINAME{{{_.reviewers[1].name}}}\n"
-        "\\def \\reviewerIIORCID{{{_.reviewers[1].orcid}}}\n"
-        "\\def \\dateRECEIVED{{{_.date_received}}}\n"
-        "\\def \\dateACCEPTED{{{_.date_accepted}}}\n"
-        "\\def \\datePUBLISHED{{{_.date_published}}}\n"
-        "\\def \\articleTITLE{{{_.title}}}\n"
-        "\\def \\articleTYPE{{{_.type}}}\n"
-        "\\def \\articleDOMAIN{{{_.domain}}}\n"
-        "\\def \\articleBIBLIOGRAPHY{{{_.bibliography}}}\n"
-        "\\def \\articleYEAR{{{_.date_published.year}}}\n"
-        "\\def \\reviewURL{{{_.review.url}}}\n"
-        # "\\def \\articleABSTRACT{{{_.abstract}}}\n"
-        "\\def \\articleABSTRACT{{{abstract}}}\n"
-        "\\def \\replicationCITE{{{_.replication.cite}}}\n"
-        "\\def \\replicationBIB{{{_.replication.bib}}}\n"
-        "\\def \\replicationURL{{{_.replication.url}}}\n"
-        "\\def \\replicationDOI{{{_.replication.doi}}}\n"
-        "\\def \\contactNAME{{{_.contact.name}}}\n"
-        "\\def \\contactEMAIL{{{_.contact.email}}}\n"
-        "\\def \\articleKEYWORDS{{{_.keywords}}}\n"
-        "\\def \\journalNAME{{{_.journal_name}}}\n"
-        "\\def \\journalVOLUME{{{_.journal_volume}}}\n"
-        "\\def \\journalISSUE{{{_.journal_issue}}}\n"
-        "\\def \\articleNUMBER{{{_.article_number}}}\n"
-        "\\def \\articleDOI{{{_.article_doi}}}\n"
-        "\\def \\authorsFULL{{{_.authors_full}}}\n"
-        "\\def \\authorsABBRV{{{_.authors_abbrv}}}\n"
-        "\\def \\authorsSHORT{{{_.authors_short}}}\n"
-        "\\title{{\\articleTITLE}}\n"
-        "\\date{{}}\n"
-        "".format(filename=filename, _=article, abstract=abstract))
+    header = (
+        f"% DO NOT EDIT - automatically generated from {filename}\n\n"
+        f"\\def \\codeURL{{{article.code.url}}}\n"
+        f"\\def \\codeDOI{{{article.code.doi}}}\n"
+        f"\\def \\codeSWH{{{article.code.swh}}}\n"
+        f"\\def \\dataURL{{{article.data.url}}}\n"
+        f"\\def \\dataDOI{{{article.data.doi}}}\n"
+        f"\\def \\editorNAME{{{article.editors[0].name}}}\n"
+        f"\\def \\editorORCID{{{article.editors[0].orcid}}}\n"
+        f"\\def \\reviewerINAME{{{article.reviewers[0].name}}}\n"
+        f"\\def \\reviewerIORCID{{{article.reviewers[0].orcid}}}\n"
+        f"\\def \\reviewerIINAME{{{article.reviewers[1].name}}}\n"
+        f"\\def \\reviewerIIORCID{{{article.reviewers[1].orcid}}}\n"
+        f"\\def \\dateRECEIVED{{{article.date_received}}}\n"
+        f"\\def \\dateACCEPTED{{{article.date_accepted}}}\n"
+        f"\\def \\datePUBLISHED{{{article.date_published}}}\n"
+        f"\\def \\articleTITLE{{{article.title}}}\n"
+        f"\\def \\articleTYPE{{{article.type}}}\n"
+        f"\\def \\articleDOMAIN{{{article.domain}}}\n"
+        f"\\def \\articleBIBLIOGRAPHY{{{article.bibliography}}}\n"
+        f"\\def \\articleYEAR{{{article.date_published.year}}}\n"
+        f"\\def \\reviewURL{{{article.review.url}}}\n"
+        # f"\\def \\articleABSTRACT{{{article.abstract}}}\n"
+        f"\\def \\articleABSTRACT{{{abstract}}}\n"
+        f"\\def \\replicationCITE{{{article.replication.cite}}}\n"
+        f"\\def \\replicationBIB{{{article.replication.bib}}}\n"
+        f"\\def \\replicationURL{{{article.replication.url}}}\n"
+        f"\\def \\replicationDOI{{{article.replication.doi}}}\n"
+        f"\\def \\contactNAME{{{article.contact.name}}}\n"
+        f"\\def \\contactEMAIL{{{article.contact.email}}}\n"
+        f"\\def \\articleKEYWORDS{{{article.keywords}}}\n"
+        f"\\def \\journalNAME{{{article.journal_name}}}\n"
+        f"\\def \\journalVOLUME{{{article.journal_volume}}}\n"
+        f"\\def \\journalISSUE{{{article.journal_issue}}}\n"
+        f"\\def \\articleNUMBER{{{article.article_number}}}\n"
+        f"\\def \\articleDOI{{{article.article_doi}}}\n"
+        f"\\def \\authorsFULL{{{article.authors_full}}}\n"
+        f"\\def \\authorsABBRV{{{article.authors_abbrv}}}\n"
+        f"\\def \\authorsSHORT{{{article.authors_short}}}\n"
+        f"\\title{{\\articleTITLE}}\n"
+        f"\\date{{}}\n")
 
+    content = [header]
     for author in article.authors:
-        affiliations = ",".join(author.affiliations)
+        affiliations = author.affil_str
         if len(author.orcid) > 0:
             affiliations += ",\\orcid{%s}" % author.orcid
-        content += "\\author[%s]{%s}\n" % (affiliations, author.name)
+        content.append("\\author[%s]{%s}\n" % (affiliations, author.name))
 
     for a in article.affiliations:
         if len(a.address) > 0:
-            content += "\\affil[{_.code}]{{{_.name}, {_.address}}}\n".format(_=a)
+            content.append("\\affil[{_.code}]{{{_.name}, {_.address}}}\n".format(_=a))
         else:
-            content += "\\affil[{_.code}]{{{_.name}}}\n".format(_=a)
+            content.append("\\affil[{_.code}]{{{_.name}}}\n".format(_=a))
                 
-    return content
+    return "".join(content)
 
 
 
@@ -87,7 +87,7 @@ if __name__ == '__main__':
     # print("Generating latex definitions ({1}) from {0}".format(filename_in, filename_out))
     
     with open(filename_in, "r") as file:
-        article = Article(file.read())
+        article = Article(file)
 
     if len(article.authors) > 0:
         content = generate_latex_metadata(filename_in, article)